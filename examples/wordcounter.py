@@ -8,6 +8,38 @@ Usage:
 
 import sys
 
+# Inputs shorter than this are counted with str.split(); below it, building
+# the word list is cheaper than importing numpy.
+VECTORIZE_THRESHOLD = 64 * 1024
+
+# ASCII characters that str.split() treats as whitespace.
+ASCII_WHITESPACE = b" \t\n\x0b\x0c\r\x1c\x1d\x1e\x1f"
+
+
+def count_words(text):
+    """Count whitespace-separated words in ``text``, like ``len(text.split())``.
+
+    The NumPy path only kicks in at ``VECTORIZE_THRESHOLD``; since Linux caps a
+    single argv string at 128 KiB (``MAX_ARG_STRLEN``), that means 64-128 KiB
+    inputs when the text arrives on the command line.
+    """
+    if len(text) < VECTORIZE_THRESHOLD or not text.isascii():
+        return len(text.split())
+    try:
+        import numpy as np  # optional: only used for very long inputs
+    except ImportError:
+        return len(text.split())
+
+    # One pass over the bytes instead of one str object per word: a word
+    # starts at every non-whitespace byte that is first or follows whitespace.
+    is_space = np.zeros(256, dtype=bool)
+    is_space[list(ASCII_WHITESPACE)] = True
+    space = is_space[np.frombuffer(text.encode("ascii"), dtype=np.uint8)]
+    starts = ~space
+    starts[1:] &= space[:-1]
+    return int(np.count_nonzero(starts))
+
+
 def main():
     if len(sys.argv) != 2:
         print("Usage: python wordcounter.py \"some text here\"", file=sys.stderr)
@@ -18,9 +50,7 @@ def main():
         print("0")
         return
 
-    # Basic whitespace split
-    count = len(text.split())
-    print(count)
+    print(count_words(text))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+gen_embedded_schema.py — bake config.schema.json into src/_embedded_schema.py.
+
+Usage:
+  python scripts/gen_embedded_schema.py
+
+chainrunner.py validates against the embedded copy instead of reading and
+parsing the schema file on every run.  Re-run this after editing the schema.
+"""
+from __future__ import annotations
+import json, pathlib, pprint
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+SCHEMA_PATH = ROOT / "config.schema.json"
+OUTPUT_PATH = ROOT / "src" / "_embedded_schema.py"
+
+HEADER = '''"""Embedded copy of config.schema.json.
+
+Generated by scripts/gen_embedded_schema.py — do not edit by hand.
+"""
+
+'''
+
+def main() -> int:
+    schema = json.loads(SCHEMA_PATH.read_bytes())
+    body = pprint.pformat(schema, indent=1, width=88, sort_dicts=False)
+    OUTPUT_PATH.write_text(f"{HEADER}SCHEMA = {body}\n", encoding="utf-8")
+    print(f"wrote {OUTPUT_PATH.relative_to(ROOT)}")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -14,6 +14,14 @@ try:
     import yaml  # pip install pyyaml
 except Exception:
     yaml = None
+    _YamlLoader = None
+else:
+    _YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)  # libyaml if built
+
+try:
+    from orjson import loads as _json_loads  # optional, faster
+except Exception:
+    _json_loads = json.loads
 
 try:
     from jsonschema import Draft7Validator
@@ -24,16 +32,18 @@ except Exception:
 SCHEMA_PATH = pathlib.Path(__file__).parent.with_name("config.schema.json")
 
 def load_json(path: pathlib.Path) -> Dict[str, Any]:
-    return json.loads(path.read_text(encoding="utf-8"))
+    return _json_loads(path.read_bytes())
 
 def load_config(path: pathlib.Path) -> Dict[str, Any]:
-    text = path.read_text(encoding="utf-8")
+    # json and yaml both accept raw bytes and detect the encoding themselves,
+    # so skip the intermediate str decode.
+    data = path.read_bytes()
     try:
-        return json.loads(text)
+        return _json_loads(data)
     except json.JSONDecodeError:
         if yaml is None:
             raise
-        return yaml.safe_load(text)
+        return yaml.load(data, Loader=_YamlLoader)
 
 def main() -> int:
     if len(sys.argv) != 2:
@@ -58,11 +68,14 @@ def main() -> int:
         return 2
 
     validator = Draft7Validator(schema)
-    errors = sorted(validator.iter_errors(cfg), key=lambda e: e.path)
-    if errors:
+    # Stop at the first error on the happy path; only collect and sort the
+    # full list when there is something to report.
+    if next(validator.iter_errors(cfg), None) is not None:
+        errors = sorted(validator.iter_errors(cfg), key=lambda e: e.path)
         print("CONFIG VALIDATION ERRORS:", file=sys.stderr)
         for err in errors:
-            path = "$" + "".join(f"[{repr(p)}]" if isinstance(p, int) else f".{p}" for p in err.path)
+            parts = ["[%r]" % p if type(p) is int else ".%s" % p for p in err.path]
+            path = "$" + "".join(parts)
             print(f" - {path}: {err.message}", file=sys.stderr)
         return 1
 
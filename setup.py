@@ -0,0 +1,20 @@
+"""Build hook for the optional Cython speedups in ``src/_chainrunner_fast.pyx``.
+
+Project metadata lives in ``pyproject.toml``; this file only adds the
+extension module when Cython is installed::
+
+    python setup.py build_ext --inplace
+"""
+from setuptools import Extension, setup
+
+try:
+    from Cython.Build import cythonize
+except ImportError:  # pragma: no cover - Cython is optional
+    ext_modules = []
+else:
+    ext_modules = cythonize(
+        [Extension("_chainrunner_fast", ["src/_chainrunner_fast.pyx"])],
+        language_level=3,
+    )
+
+setup(package_dir={"": "src"}, ext_modules=ext_modules)
@@ -0,0 +1,40 @@
+# cython: language_level=3
+"""Compiled helpers for :mod:`chainrunner`.
+
+Optional: ``chainrunner`` falls back to pure-Python versions of these
+functions when the extension has not been built.  Build it in place with::
+
+    python setup.py build_ext --inplace
+"""
+
+from libc.math cimport floor, isfinite
+
+
+cpdef str render_segments(tuple segments, object variables):
+    """Join compiled template ``segments``, looking variables up in ``variables``.
+
+    ``variables`` is either a mapping keyed by name or a list indexed by slot.
+    Raises ``KeyError`` for a name missing from a mapping.
+    """
+
+    cdef list parts = []
+    cdef str lit
+    cdef object var
+    for lit, var in segments:
+        if var is None:
+            parts.append(lit)
+        else:
+            parts.append(str(variables[var]))
+    return "".join(parts)
+
+
+cpdef object coerce_number(object value):
+    """Parse ``value`` as a number, returning an ``int`` for integral values.
+
+    Raises ``ValueError`` if ``value`` is not numeric.
+    """
+
+    cdef double num = float(value)
+    if isfinite(num) and num == floor(num):
+        return int(num)
+    return num
@@ -0,0 +1,54 @@
+"""Embedded copy of config.schema.json.
+
+Generated by scripts/gen_embedded_schema.py — do not edit by hand.
+"""
+
+SCHEMA = {'$schema': 'http://json-schema.org/draft-07/schema#',
+ 'title': 'LangChain Config-Driven Runner (MVP)',
+ 'type': 'object',
+ 'properties': {'models': {'type': 'array',
+                           'items': {'type': 'object',
+                                     'required': ['name', 'provider', 'model'],
+                                     'properties': {'name': {'type': 'string'},
+                                                    'provider': {'type': 'string',
+                                                                 'enum': ['ollama']},
+                                                    'model': {'type': 'string'},
+                                                    'baseUrl': {'type': 'string'},
+                                                    'params': {'type': 'object'}},
+                                     'additionalProperties': False}},
+                'steps': {'type': 'array',
+                          'items': {'type': 'object',
+                                    'required': ['step', 'inputs', 'outputs'],
+                                    'properties': {'step': {'type': 'integer',
+                                                            'minimum': 1},
+                                                   'inputs': {'type': 'array',
+                                                              'items': {'type': 'string'},
+                                                              'minItems': 1},
+                                                   'outputs': {'type': 'object',
+                                                               'minProperties': 1,
+                                                               'maxProperties': 1,
+                                                               'patternProperties': {'^[a-zA-Z_][a-zA-Z0-9_]*$': {'type': 'string',
+                                                                                                                  'enum': ['string',
+                                                                                                                           'number']}},
+                                                               'additionalProperties': False},
+                                                   'modelRef': {'type': 'string'},
+                                                   'model': {'type': 'object',
+                                                             'required': ['provider',
+                                                                          'model'],
+                                                             'properties': {'provider': {'type': 'string',
+                                                                                         'enum': ['ollama']},
+                                                                            'model': {'type': 'string'},
+                                                                            'baseUrl': {'type': 'string'},
+                                                                            'params': {'type': 'object'}},
+                                                             'additionalProperties': False},
+                                                   'systemPrompt': {'type': 'string'},
+                                                   'command': {'type': 'array',
+                                                               'items': {'type': 'string'},
+                                                               'minItems': 1}},
+                                    'oneOf': [{'required': ['systemPrompt']},
+                                              {'required': ['command']}],
+                                    'not': {'required': ['systemPrompt', 'command']},
+                                    'additionalProperties': False},
+                          'minItems': 1}},
+ 'required': ['steps'],
+ 'additionalProperties': False}
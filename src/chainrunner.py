@@ -15,50 +15,144 @@ Example:
 from __future__ import annotations
 
 import argparse
+import atexit
+import concurrent.futures
 from dotenv import load_dotenv
+import functools
 import json
+import operator
 import os
 import pathlib
-import re
 import subprocess
 import sys
-from dataclasses import dataclass
+import threading
+from dataclasses import dataclass, field
 from typing import Any, Dict, Iterable, Mapping, MutableMapping
 
 try:
     import yaml
 except Exception:  # pragma: no cover - optional dep
     yaml = None  # type: ignore
+    _YamlLoader = None
+else:
+    # Prefer the libyaml-backed loader; fall back to the pure-Python one.
+    _YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+try:  # optional: faster JSON parsing straight from bytes
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover - optional dep
+    _json_loads = json.loads
 
 try:
     from jsonschema import Draft7Validator
 except Exception as exc:  # pragma: no cover - jsonschema is required
     raise SystemExit("jsonschema is required: pip install jsonschema") from exc
 
+try:  # optional compiled helpers, built with ``python setup.py build_ext --inplace``
+    from _chainrunner_fast import coerce_number as _coerce_number
+    from _chainrunner_fast import render_segments as _render_segments
+except ImportError:
+
+    def _render_segments(segments: tuple[tuple[str, Any], ...], variables: Any) -> str:
+        # ``variables`` is a name-keyed mapping or a slot-indexed list.
+        return "".join([lit if var is None else str(variables[var]) for lit, var in segments])
+
+    def _coerce_number(value: str | bytes) -> int | float:
+        num = float(value)
+        if num.is_integer():
+            return int(num)
+        return num
+
+
 load_dotenv()
 
 DEBUG = bool(int(os.getenv("LCDR_DEBUG", 0)))
 
+
+def _env_workers(name: str, default: int) -> int:
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        raise SystemExit(f"{name} must be a positive integer, got {raw!r}") from None
+    if value < 1:
+        raise SystemExit(f"{name} must be a positive integer, got {raw!r}")
+    return value
+
+
+# Upper bound on steps executed concurrently.  The default of 1 runs steps
+# strictly in order; larger values let steps without variable dependencies
+# on each other overlap.
+MAX_WORKERS = _env_workers("LCDR_MAX_WORKERS", 1)
+
 # In case you want to verify that the chain is running in the right order
 if DEBUG is True:
     import langchain
     langchain.debug = True
 # ---- Config loading -------------------------------------------------------
 
-SCHEMA_PATH = os.getenv("LCDR_SCHEMA_PATH", pathlib.Path(__file__).parent.with_name("config.schema.json"))
-TEMPLATE_RE = re.compile(r"{{\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*}}")
+_DEFAULT_SCHEMA_PATH = pathlib.Path(__file__).parent.with_name("config.schema.json")
+SCHEMA_PATH = pathlib.Path(os.getenv("LCDR_SCHEMA_PATH", _DEFAULT_SCHEMA_PATH))
+
+try:  # generated by scripts/gen_embedded_schema.py
+    from _embedded_schema import SCHEMA as _EMBEDDED_SCHEMA
+except ImportError:  # pragma: no cover - fall back to reading SCHEMA_PATH
+    _EMBEDDED_SCHEMA = None
 
 
 class ConfigError(RuntimeError):
     """Raised when the configuration fails validation."""
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ModelInfo:
     provider: str
     model: str
     base_url: str | None = None
     params: Dict[str, Any] | None = None
+    # Constructor keyword arguments, built once instead of on every _build().
+    _kwargs: Dict[str, Any] = field(init=False, repr=False, compare=False)
+    # Key for the shared client cache; None when a param value is unhashable.
+    _cache_key: tuple[Any, ...] | None = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        params = self.params or {}
+        kwargs = dict(model=self.model, base_url=self.base_url, **params)
+        key: tuple[Any, ...] | None = (self.model, self.base_url, tuple(sorted(params.items())))
+        try:
+            hash(key)
+        except TypeError:
+            key = None
+        object.__setattr__(self, "_kwargs", kwargs)
+        object.__setattr__(self, "_cache_key", key)
+
+
+_ChatOllama: type | None = None
+
+
+def _get_chat_ollama() -> type:
+    """Import ``langchain_ollama.ChatOllama`` on first use and remember it."""
+
+    global _ChatOllama
+    if _ChatOllama is None:
+        from langchain_ollama import ChatOllama
+
+        _ChatOllama = ChatOllama
+    return _ChatOllama
+
+
+@functools.lru_cache(maxsize=64)
+def _cached_chat_model(chat_cls: type, key: tuple[Any, ...]) -> Any:
+    """Build one ``chat_cls`` per ``(model, base_url, params)`` for the process.
+
+    Sharing the instance across registries and runs keeps its HTTP client, and
+    therefore its keep-alive connections, alive between chain executions.
+    """
+
+    model, base_url, params = key
+    return chat_cls(model=model, base_url=base_url, **dict(params))
 
 
 class ModelRegistry:
@@ -80,10 +174,10 @@ class ModelRegistry:
     def _build(self, info: ModelInfo) -> Any:
         if info.provider != "ollama":
             raise ConfigError(f"unsupported provider: {info.provider}")
-        from langchain_ollama import ChatOllama
-
-        params = info.params or {}
-        return ChatOllama(model=info.model, base_url=info.base_url, **params)
+        ChatOllama = _get_chat_ollama()
+        if info._cache_key is None:
+            return ChatOllama(**info._kwargs)
+        return _cached_chat_model(ChatOllama, info._cache_key)
 
     # Public API -----------------------------------------------------------
     def get(self, name: str) -> Any:
@@ -108,56 +202,213 @@ class ModelRegistry:
 
 
 def load_json(path: pathlib.Path) -> Dict[str, Any]:
-    return json.loads(path.read_text(encoding="utf-8"))
+    return _json_loads(path.read_bytes())
 
 
 def load_config(path: pathlib.Path) -> Dict[str, Any]:
-    text = path.read_text(encoding="utf-8")
+    # json and yaml both accept raw bytes and detect the encoding themselves,
+    # so skip the intermediate str decode.
+    data = path.read_bytes()
     try:
-        return json.loads(text)
+        return _json_loads(data)
     except json.JSONDecodeError:
         if yaml is None:
             raise
-        return yaml.safe_load(text)
+        return yaml.load(data, Loader=_YamlLoader)
+
+
+# A compiled template is either a plain string (no placeholders) or a tuple of
+# ``(literal, None)`` / ``("", var_name)`` segments.
+CompiledTemplate = str | tuple[tuple[str, str | None], ...]
+# The same shape with variable names replaced by slot indices into the
+# ``values`` list ``run_chain`` keeps instead of a variables dict.
+BoundTemplate = str | tuple[tuple[str, int | None], ...]
+
+# Slot of the reserved ``userRequest`` variable.
+_USER_REQUEST_SLOT = 0
+
+
+def _tokenize(template: str) -> list[tuple[str, str | None]]:
+    """Split ``template`` into ``(literal, None)`` / ``("", var_name)`` segments.
+
+    A placeholder is ``{{`` + optional whitespace + an ASCII identifier +
+    optional whitespace + ``}}``; anything else is kept as literal text.
+    """
+
+    segments: list[tuple[str, str | None]] = []
+    literal_start = 0
+    pos = template.find("{{")
+    while pos != -1:
+        end = template.find("}}", pos + 2)
+        if end == -1:
+            break
+        name = template[pos + 2 : end].strip()
+        if name.isidentifier() and name.isascii():
+            if pos > literal_start:
+                segments.append((template[literal_start:pos], None))
+            segments.append(("", name))
+            literal_start = end + 2
+            pos = template.find("{{", literal_start)
+        else:
+            pos = template.find("{{", pos + 1)
+    if literal_start < len(template):
+        segments.append((template[literal_start:], None))
+    return segments
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_template(template: str) -> CompiledTemplate:
+    """Split ``template`` into literal and ``{{var}}`` segments once."""
+
+    segments = _tokenize(template)
+    if all(var is None for _, var in segments):
+        return template
+    return tuple(segments)
+
+
+def _render_compiled(compiled: CompiledTemplate, variables: Mapping[str, Any]) -> str:
+    if type(compiled) is str:
+        return compiled
+    try:
+        if DEBUG:
+            for _, var in compiled:
+                if var is not None:
+                    print(f"VARIABLE:{var} VALUE:{str(variables[var])}")
+        return _render_segments(compiled, variables)
+    except KeyError as exc:
+        raise ConfigError(f"unknown variable: {exc.args[0]}") from None
+
+
+def _bind_template(compiled: CompiledTemplate, slots: Mapping[str, int]) -> BoundTemplate:
+    if type(compiled) is str:
+        return compiled
+    return tuple((lit, None if var is None else slots[var]) for lit, var in compiled)
+
+
+def _render_bound(bound: BoundTemplate, values: list[Any], names: list[str]) -> str:
+    if type(bound) is str:
+        return bound
+    if DEBUG:
+        for _, slot in bound:
+            if slot is not None:
+                print(f"VARIABLE:{names[slot]} VALUE:{str(values[slot])}")
+    return _render_segments(bound, values)
+
+
+def _template_vars(compiled: CompiledTemplate) -> list[str]:
+    if type(compiled) is str:
+        return []
+    return [var for _, var in compiled if var is not None]
+
+
+def _step_templates(step: Mapping[str, Any]) -> list[str]:
+    if "systemPrompt" in step:
+        return [step["systemPrompt"]]
+    return list(step["command"])
 
 
 def render_template(template: str, variables: Mapping[str, Any]) -> str:
     """Replace ``{{var}}`` placeholders using ``variables``."""
 
-    def repl(match: re.Match[str]) -> str:
-        key = match.group(1)
-        if key not in variables:
-            raise ConfigError(f"unknown variable: {key}")
-        if DEBUG:
-            print(f"VARIABLE:{key} VALUE:{str(variables[key])}")
-        return str(variables[key])
-
-    return TEMPLATE_RE.sub(repl, template)
+    return _render_compiled(_compile_template(template), variables)
 
 
 # ---- Validation -----------------------------------------------------------
 
 
-def validate_config(cfg: Mapping[str, Any]) -> None:
-    """Validate ``cfg`` structurally and semantically."""
+@functools.lru_cache(maxsize=1)
+def _get_validator(schema_path: str, mtime: float) -> Draft7Validator:
+    """Return a compiled validator for ``schema_path``.
+
+    ``mtime`` is part of the cache key so edits to the schema file are picked
+    up without restarting the process.
+    """
+
+    schema = load_json(pathlib.Path(schema_path))
+    Draft7Validator.check_schema(schema)
+    return Draft7Validator(schema)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_embedded_validator() -> Draft7Validator:
+    """Return a compiled validator for the schema baked into ``_embedded_schema``."""
+
+    Draft7Validator.check_schema(_EMBEDDED_SCHEMA)
+    return Draft7Validator(_EMBEDDED_SCHEMA)
 
-    schema = load_json(SCHEMA_PATH)
-    Draft7Validator(schema).validate(cfg)
+
+def _schema_validator() -> Draft7Validator:
+    # The embedded copy only stands in for the default schema file; an
+    # LCDR_SCHEMA_PATH override is always read from disk.
+    if _EMBEDDED_SCHEMA is not None and SCHEMA_PATH == _DEFAULT_SCHEMA_PATH:
+        return _get_embedded_validator()
+    return _get_validator(str(SCHEMA_PATH), SCHEMA_PATH.stat().st_mtime)
+
+
+@dataclass(slots=True, frozen=True)
+class _StepPlan:
+    """A validated step with everything ``run_chain`` needs precomputed."""
+
+    step_no: int
+    kind: str  # "llm" or "cmd"
+    out_name: str
+    out_slot: int
+    out_type: str
+    reads: frozenset[int]  # slots of every variable the step reads
+    names: list[str]  # variable name of each slot, for debug output
+    prompt: BoundTemplate | None = None
+    model_ref: str | None = None
+    model_cfg: Mapping[str, Any] | None = None
+    command: tuple[BoundTemplate, ...] | None = None
+
+
+def validate_config(cfg: Mapping[str, Any]) -> list[_StepPlan]:
+    """Validate ``cfg`` structurally and semantically.
+
+    Returns an execution plan for each step, sorted by step number.  Every
+    variable is assigned an integer slot (``userRequest`` is slot 0) which the
+    plans use in place of variable names.
+    """
+
+    _schema_validator().validate(cfg)
 
     models = {m["name"] for m in cfg.get("models", [])}
     seen_steps: set[int] = set()
-    known_vars: set[str] = {"userRequest"}
+    slots: dict[str, int] = {"userRequest": _USER_REQUEST_SLOT}
+    names: list[str] = ["userRequest"]  # slot -> name, shared by every plan
 
-    for step in sorted(cfg["steps"], key=lambda s: s["step"]):
+    plans: list[_StepPlan] = []
+    for step in sorted(cfg["steps"], key=operator.itemgetter("step")):
         step_no = step["step"]
         if step_no in seen_steps:
             raise ConfigError(f"duplicate step number: {step_no}")
         seen_steps.add(step_no)
 
         for inp in step["inputs"]:
-            if inp not in known_vars:
+            if inp not in slots:
                 raise ConfigError(f"step {step_no} references unknown input '{inp}'")
 
+        compiled = [_compile_template(t) for t in _step_templates(step)]
+        reads = {slots[inp] for inp in step["inputs"]}
+        for template in compiled:
+            for var in _template_vars(template):
+                if var not in slots:
+                    raise ConfigError(f"step {step_no} references unknown variable '{var}'")
+                reads.add(slots[var])
+
+        out_name, out_type = next(iter(step["outputs"].items()))
+        if out_name not in slots:
+            slots[out_name] = len(names)
+            names.append(out_name)
+        common = dict(
+            step_no=step_no,
+            out_name=out_name,
+            out_slot=slots[out_name],
+            out_type=out_type,
+            reads=frozenset(reads),
+            names=names,
+        )
+        bound = [_bind_template(t, slots) for t in compiled]
         if "systemPrompt" in step:
             if "modelRef" in step:
                 if step["modelRef"] not in models:
@@ -168,64 +419,340 @@ def validate_config(cfg: Mapping[str, Any]) -> None:
                 raise ConfigError(
                     f"step {step_no} missing model or modelRef for LLM step"
                 )
+            plan = _StepPlan(
+                kind="llm",
+                prompt=bound[0],
+                model_ref=step.get("modelRef"),
+                model_cfg=step.get("model"),
+                **common,
+            )
+        else:
+            plan = _StepPlan(kind="cmd", command=tuple(bound), **common)
+        plans.append(plan)
 
-        out_name = next(iter(step["outputs"].keys()))
-        known_vars.add(out_name)
+    return plans
 
 
 # ---- Execution ------------------------------------------------------------
 
+# Source of the long-lived worker used by ``_CommandExecutor``.  It reads JSON
+# requests, one per line, from a private pipe and forks a child per snippet, so
+# each snippet starts from the same pristine interpreter state.  The child's fd
+# 1 and 2 point at temporary files; anything written there (print, os.write,
+# subprocesses, C extensions) is captured.  Replies go back over a second
+# private pipe as b"<returncode> <len stdout> <len stderr>\n" + stdout + stderr.
+_WORKER_SOURCE = r"""
+import json, os, sys, tempfile, types
+
+req_fd, reply_fd = int(sys.argv[1]), int(sys.argv[2])
+os.set_inheritable(req_fd, False)
+os.set_inheritable(reply_fd, False)
+requests = os.fdopen(req_fd, "rb")
+replies = os.fdopen(reply_fd, "wb")
+stdout_encoding, stdout_errors = sys.stdout.encoding, sys.stdout.errors
+stderr_encoding, stderr_errors = sys.stderr.encoding, sys.stderr.errors
+
+
+def run_child(req, out_fd, err_fd):
+    code = 1
+    try:
+        os.close(req_fd)
+        os.close(reply_fd)
+        os.dup2(out_fd, 1)
+        os.dup2(err_fd, 2)
+        os.close(out_fd)
+        os.close(err_fd)
+        sys.stdout = sys.__stdout__ = open(
+            1, "w", encoding=stdout_encoding, errors=stdout_errors, closefd=False
+        )
+        sys.stderr = sys.__stderr__ = open(
+            2, "w", buffering=1, encoding=stderr_encoding, errors=stderr_errors,
+            closefd=False,
+        )
+        os.chdir(req["cwd"])
+        os.environ.clear()
+        os.environ.update(req["env"])
+        sys.argv = ["-c", *req["args"]]
+        # The worker runs with -P so its own imports ignore the caller's cwd;
+        # snippets get back the "" entry that ``python -c`` puts first.
+        sys.path.insert(0, "")
+        main = types.ModuleType("__main__")
+        sys.modules["__main__"] = main
+        code = 0
+        try:
+            exec(compile(req["snippet"], "<string>", "exec"), main.__dict__)
+        except SystemExit as exc:
+            if exc.code is None:
+                code = 0
+            elif isinstance(exc.code, int):
+                code = exc.code
+            else:
+                print(exc.code, file=sys.stderr)
+                code = 1
+        except BaseException as exc:
+            # Drop the run_child frame so the traceback matches ``python -c``.
+            exc.__traceback__ = exc.__traceback__.tb_next
+            sys.excepthook(type(exc), exc, exc.__traceback__)
+            code = 1
+        # Mirror interpreter shutdown: join non-daemon threads, then atexit.
+        import atexit, threading
+        threading._shutdown()
+        atexit._run_exitfuncs()
+        sys.stdout.flush()
+        sys.stderr.flush()
+    finally:
+        os._exit(code & 0xFF)
+
+
+for line in requests:
+    req = json.loads(line)
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        pid = os.fork()
+        if pid == 0:
+            run_child(req, out.fileno(), err.fileno())
+        _, status = os.waitpid(pid, 0)
+        out.seek(0)
+        err.seek(0)
+        stdout, stderr = out.read(), err.read()
+    code = os.waitstatus_to_exitcode(status)
+    replies.write(b"%d %d %d\n" % (code, len(stdout), len(stderr)) + stdout + stderr)
+    replies.flush()
+"""
 
-def coerce(value: str, expected_type: str) -> Any:
+
+class _CommandExecutor:
+    """Run ``[sys.executable, "-c", snippet, ...]`` steps through a fork server.
+
+    Starting a fresh interpreter dominates the cost of small Python command
+    steps, so those are handed to a long-lived worker which forks a copy of
+    itself per snippet.  The child gets its own ``sys.argv``, working directory,
+    environment and ``__main__`` and its fd 1/2 are captured, so it behaves like
+    ``python -c`` without paying for interpreter startup.  Any other command,
+    or any command on platforms without ``os.fork``, is executed with
+    :func:`subprocess.run`.
+
+    The worker sends back the child's captured output as raw bytes, so both
+    paths return the same :class:`subprocess.CompletedProcess` ``[bytes]`` (or
+    raise the same :class:`subprocess.CalledProcessError`) byte for byte.
+    """
+
+    def __init__(self) -> None:
+        self._proc: subprocess.Popen[bytes] | None = None
+        self._requests: Any = None
+        self._replies: Any = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _is_python_snippet(cmd: list[str]) -> bool:
+        return (
+            hasattr(os, "fork")
+            and len(cmd) >= 3
+            and cmd[0] == sys.executable
+            and cmd[1] == "-c"
+        )
+
+    def _start_worker(self) -> None:
+        req_r, req_w = os.pipe()
+        reply_r, reply_w = os.pipe()
+        try:
+            self._proc = subprocess.Popen(
+                [sys.executable, "-P", "-c", _WORKER_SOURCE, str(req_r), str(reply_w)],
+                stdout=subprocess.DEVNULL,
+                pass_fds=(req_r, reply_w),
+            )
+        finally:
+            os.close(req_r)
+            os.close(reply_w)
+        self._requests = os.fdopen(req_w, "wb")
+        self._replies = os.fdopen(reply_r, "rb")
+
+    def _read_reply(self) -> tuple[int, bytes, bytes] | None:
+        header = self._replies.readline().split()
+        if len(header) != 3:
+            return None
+        code, out_len, err_len = map(int, header)
+        stdout = self._replies.read(out_len)
+        stderr = self._replies.read(err_len)
+        if len(stdout) != out_len or len(stderr) != err_len:
+            return None
+        return code, stdout, stderr
+
+    def run(self, cmd: list[str]) -> subprocess.CompletedProcess[bytes]:
+        """Execute ``cmd`` and return its raw output, raising on a non-zero exit."""
+
+        if not self._is_python_snippet(cmd):
+            # close_fds=False lets CPython use posix_spawn() instead of
+            # fork()+exec() and skips closing every descriptor in the child;
+            # descriptors Python opens are non-inheritable (PEP 446) anyway.
+            return subprocess.run(cmd, capture_output=True, check=True, close_fds=False)
+
+        request = json.dumps(
+            {"cwd": os.getcwd(), "env": dict(os.environ), "snippet": cmd[2], "args": cmd[3:]}
+        )
+        with self._lock:
+            if self._proc is None or self._proc.poll() is not None:
+                self._close_locked()
+                self._start_worker()
+            try:
+                self._requests.write(request.encode("ascii") + b"\n")
+                self._requests.flush()
+                reply = self._read_reply()
+            except (OSError, ValueError):
+                reply = None
+            if reply is None:
+                # The worker itself died or broke protocol; start a fresh one
+                # next time and report this step as a failed process.
+                self._close_locked()
+                raise subprocess.CalledProcessError(1, cmd)
+
+        code, stdout, stderr = reply
+        if code:
+            raise subprocess.CalledProcessError(code, cmd, stdout, stderr)
+        return subprocess.CompletedProcess(cmd, 0, stdout, stderr)
+
+    def _close_locked(self) -> None:
+        proc, self._proc = self._proc, None
+        for stream in (self._requests, self._replies):
+            if stream is not None:
+                try:
+                    stream.close()
+                except OSError:
+                    pass
+        self._requests = self._replies = None
+        if proc is None:
+            return
+        try:
+            proc.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_locked()
+
+
+_EXECUTOR = _CommandExecutor()
+atexit.register(_EXECUTOR.close)
+
+
+def coerce(value: str | bytes, expected_type: str) -> Any:
     if expected_type == "string":
         return value
     if expected_type == "number":
         try:
-            num = float(value)
+            return _coerce_number(value)
         except ValueError as exc:
+            if isinstance(value, bytes):
+                value = value.decode("utf-8", "replace")
             raise RuntimeError(f"cannot convert output to number: {value!r}") from exc
-        if num.is_integer():
-            return int(num)
-        return num
     raise RuntimeError(f"unsupported output type: {expected_type}")
 
 
-def run_chain(cfg: Mapping[str, Any], user_input: str) -> Any:
-    validate_config(cfg)
-    registry = ModelRegistry(cfg.get("models"))
-    variables: Dict[str, Any] = {"userRequest": user_input}
-
-    steps = sorted(cfg["steps"], key=lambda s: s["step"])
-    final_var = None
-    for step in steps:
-        out_name, out_type = next(iter(step["outputs"].items()))
-        final_var = out_name
+def _step_dependencies(plans: list[_StepPlan]) -> list[set[int]]:
+    """Return, for each step, the indices of earlier steps it must wait for.
+
+    A step waits for the latest earlier producer of every variable it reads.
+    Because later steps may overwrite variables, a step also waits for the
+    previous producer of its output and for every step that read that previous
+    value, so running independent steps concurrently gives the same result as
+    running them in order.
+    """
+
+    last_writer: dict[int, int] = {}
+    readers: dict[int, list[int]] = {}
+    deps: list[set[int]] = []
+    for idx, plan in enumerate(plans):
+        out_slot = plan.out_slot
+        step_deps = {last_writer[slot] for slot in plan.reads if slot in last_writer}
+        if out_slot in last_writer:
+            step_deps.add(last_writer[out_slot])
+        step_deps.update(readers.get(out_slot, ()))
+        step_deps.discard(idx)
+        deps.append(step_deps)
+
+        for slot in plan.reads:
+            readers.setdefault(slot, []).append(idx)
+        last_writer[out_slot] = idx
+        readers[out_slot] = []
+    return deps
+
+
+def _execute_step(plan: _StepPlan, values: list[Any], registry: ModelRegistry) -> Any:
+    """Run a single step and return its coerced output value."""
+
+    # Render inputs into templates
+    if plan.kind == "llm":
+        prompt = _render_bound(plan.prompt, values, plan.names)
+        if plan.model_ref is not None:
+            llm = registry.get(plan.model_ref)
+        else:
+            llm = registry.from_inline(plan.model_cfg)
+        # run model
+        result = llm.invoke(prompt)  # returns a BaseMessage
+        output_text = getattr(result, "content", str(result)).strip()
+    else:  # command step
+        cmd = [_render_bound(x, values, plan.names) for x in plan.command]
+        proc = _EXECUTOR.run(cmd)
+        raw = proc.stdout.strip()
+        if plan.out_type == "number":
+            # float() parses bytes directly, so numbers skip the decode.
+            return coerce(raw, plan.out_type)
+        output_text = raw.decode("utf-8", "replace")
+
+    # Strings are the common case and need no conversion.
+    if plan.out_type == "string":
+        return output_text
+    return coerce(output_text, plan.out_type)
 
-        # Render inputs into templates
-        if "systemPrompt" in step:
-            prompt = render_template(step["systemPrompt"], variables)
-            if "modelRef" in step:
-                llm = registry.get(step["modelRef"])
-            else:
-                llm = registry.from_inline(step["model"])
-            # run model
-            result = llm.invoke(prompt)  # returns a BaseMessage
-            output_text = getattr(result, "content", str(result)).strip()
-        else:  # command step
-            cmd = [render_template(x, variables) for x in step["command"]]
-            proc = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            output_text = proc.stdout.strip()
-
-        variables[out_name] = coerce(output_text, out_type)
 
-    if final_var is None:
+def run_chain(cfg: Mapping[str, Any], user_input: str) -> Any:
+    plans = validate_config(cfg)
+    registry = ModelRegistry(cfg.get("models"))
+    if not plans:
         raise RuntimeError("no steps to execute")
-    return variables[final_var]
+    values: list[Any] = [None] * len(plans[0].names)
+    values[_USER_REQUEST_SLOT] = user_input
+
+    deps = _step_dependencies(plans)
+    linear = all(idx - 1 in d for idx, d in enumerate(deps) if idx)
+    if MAX_WORKERS == 1 or linear:
+        for plan in plans:
+            values[plan.out_slot] = _execute_step(plan, values, registry)
+        return values[plans[-1].out_slot]
+
+    # Independent steps run concurrently.  Results are written only here on
+    # the scheduling thread, and the dependency graph keeps any running step
+    # from reading a slot while it is being written.
+    pending = dict(enumerate(deps))
+    finished: set[int] = set()
+    errors: dict[int, BaseException] = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        running: dict[concurrent.futures.Future[Any], int] = {}
+        while pending or running:
+            if not errors:
+                ready = [idx for idx, d in pending.items() if d <= finished]
+                for idx in ready:
+                    del pending[idx]
+                    fut = pool.submit(_execute_step, plans[idx], values, registry)
+                    running[fut] = idx
+            if not running:
+                break
+            done, _ = concurrent.futures.wait(
+                running, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for fut in done:
+                idx = running.pop(fut)
+                exc = fut.exception()
+                if exc is not None:
+                    errors[idx] = exc
+                    continue
+                values[plans[idx].out_slot] = fut.result()
+                finished.add(idx)
+
+    if errors:
+        raise errors[min(errors)]
+    return values[plans[-1].out_slot]
 
 
 # ---- CLI ------------------------------------------------------------------
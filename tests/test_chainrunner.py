@@ -11,6 +11,7 @@ from __future__ import annotations
 import json
 import subprocess
 import sys
+import threading
 import types
 from pathlib import Path
 from typing import Any, Callable, Mapping
@@ -65,6 +66,8 @@ def install_fake_chatollama(
 
     fake_module = types.SimpleNamespace(ChatOllama=FakeChatOllama)
     monkeypatch.setitem(sys.modules, "langchain_ollama", fake_module)
+    # Drop the class chainrunner remembered from a previous import.
+    monkeypatch.setattr(chainrunner, "_ChatOllama", None)
     return FakeChatOllama
 
 
@@ -83,6 +86,21 @@ def test_render_template_unknown_variable_raises_config_error() -> None:
         chainrunner.render_template("{{missing}}", {})
 
 
+def test_compile_template_splits_literals_and_variables() -> None:
+    assert chainrunner._compile_template("no placeholders") == "no placeholders"
+    assert chainrunner._compile_template("Hi {{ name }}!{{x}}") == (
+        ("Hi ", None),
+        ("", "name"),
+        ("!", None),
+        ("", "x"),
+    )
+
+
+def test_compile_template_keeps_malformed_placeholders_literal() -> None:
+    assert chainrunner._compile_template("{{ not valid }} {{x") == "{{ not valid }} {{x"
+    assert chainrunner._compile_template("{{{a}}}") == (("{", None), ("", "a"), ("}", None))
+
+
 # ---------------------------------------------------------------------------
 # Config validation
 # ---------------------------------------------------------------------------
@@ -160,6 +178,42 @@ def test_validate_config_accepts_inline_model_definition() -> None:
     chainrunner.validate_config(cfg)
 
 
+def test_validate_config_returns_steps_in_order() -> None:
+    cfg = minimal_command_config()
+    second = dict(cfg["steps"][0], step=2, outputs={"again": "string"})
+    cfg["steps"].insert(0, second)
+    plans = chainrunner.validate_config(cfg)
+    assert [p.step_no for p in plans] == [1, 2]
+    assert [p.out_name for p in plans] == ["result", "again"]
+    assert [p.out_slot for p in plans] == [1, 2]
+    assert plans[0].command[-1] == (("", 0),)  # {{userRequest}} is slot 0
+    assert plans[0].kind == "cmd"
+
+
+def test_validate_config_unknown_template_variable() -> None:
+    cfg = minimal_command_config()
+    cfg["steps"][0]["command"].append("{{later}}")
+    with pytest.raises(ConfigError, match="references unknown variable 'later'"):
+        chainrunner.validate_config(cfg)
+
+
+def test_validate_config_reuses_compiled_validator(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(chainrunner, "_EMBEDDED_SCHEMA", None)
+    chainrunner._get_validator.cache_clear()
+    chainrunner.validate_config(minimal_command_config())
+    chainrunner.validate_config(minimal_command_config())
+    info = chainrunner._get_validator.cache_info()
+    assert info.misses == 1
+    assert info.hits == 1
+
+
+def test_embedded_schema_matches_config_schema() -> None:
+    schema = json.loads((PROJECT_ROOT / "config.schema.json").read_text(encoding="utf-8"))
+    assert chainrunner._EMBEDDED_SCHEMA == schema, (
+        "config.schema.json changed; run scripts/gen_embedded_schema.py"
+    )
+
+
 # ---------------------------------------------------------------------------
 # Model registry
 # ---------------------------------------------------------------------------
@@ -247,6 +301,21 @@ def test_model_registry_build_instantiates_chatollama(monkeypatch: pytest.Monkey
     }
 
 
+def test_model_registry_shares_clients_across_registries(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    install_fake_chatollama(monkeypatch, response=lambda prompt: prompt)
+    models = [
+        {"name": "a", "provider": "ollama", "model": "m", "params": {"temperature": 0}},
+        {"name": "b", "provider": "ollama", "model": "m", "params": {"stop": ["x"]}},
+    ]
+    first = chainrunner.ModelRegistry(models)
+    second = chainrunner.ModelRegistry(models)
+    assert first.get("a") is second.get("a")
+    # Unhashable params cannot be cached and get a fresh instance each time.
+    assert first.get("b") is not second.get("b")
+
+
 def test_model_registry_rejects_unknown_provider() -> None:
     registry = chainrunner.ModelRegistry(
         [{"name": "bad", "provider": "not-ollama", "model": "foo"}]
@@ -264,6 +333,12 @@ def test_coerce_handles_string_and_numbers() -> None:
     assert chainrunner.coerce("value", "string") == "value"
     assert chainrunner.coerce("42", "number") == 42
     assert chainrunner.coerce("3.14", "number") == pytest.approx(3.14)
+    assert chainrunner.coerce(b"7", "number") == 7
+
+
+def test_coerce_invalid_number_bytes_reports_text() -> None:
+    with pytest.raises(RuntimeError, match="cannot convert output to number: 'abc'"):
+        chainrunner.coerce(b"abc", "number")
 
 
 def test_coerce_invalid_number_raises_runtime_error() -> None:
@@ -384,6 +459,319 @@ def test_run_chain_surfaces_command_failure() -> None:
         chainrunner.run_chain(cfg, "ignored")
 
 
+def test_run_chain_reuses_python_worker_for_snippets() -> None:
+    # Each snippet runs in a child forked from the same long-lived worker.
+    cfg = {
+        "steps": [
+            {
+                "step": 1,
+                "inputs": ["userRequest"],
+                "outputs": {"first": "string"},
+                "command": make_python_command("import os; print(os.getppid())"),
+            },
+            {
+                "step": 2,
+                "inputs": ["first"],
+                "outputs": {"same": "string"},
+                "command": make_python_command(
+                    "import os, sys; print(os.getppid() == int(sys.argv[1]) != os.getpid())",
+                    "{{first}}",
+                ),
+            },
+        ]
+    }
+    assert chainrunner.run_chain(cfg, "ignored") == "True"
+
+
+def test_step_dependencies_respect_overwrites() -> None:
+    def step(no: int, inputs: list[str], out: str) -> dict[str, Any]:
+        return {
+            "step": no,
+            "inputs": inputs,
+            "outputs": {out: "string"},
+            "command": ["echo", *("{{%s}}" % name for name in inputs)],
+        }
+
+    cfg = {
+        "steps": [
+            step(1, ["userRequest"], "a"),
+            step(2, ["userRequest"], "b"),
+            step(3, ["a"], "c"),
+            step(4, ["userRequest"], "a"),
+            step(5, ["a", "b", "c"], "result"),
+        ]
+    }
+    plans = chainrunner.validate_config(cfg)
+    assert chainrunner._step_dependencies(plans) == [set(), set(), {0}, {0, 2}, {1, 2, 3}]
+
+
+def test_run_chain_runs_independent_steps_concurrently(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    barrier = threading.Barrier(2, timeout=5)
+
+    def respond(prompt: str) -> str:
+        if prompt.startswith("wait"):
+            barrier.wait()
+        return prompt
+
+    install_fake_chatollama(monkeypatch, response=respond)
+    monkeypatch.setattr(chainrunner, "MAX_WORKERS", 2)
+
+    model = {"provider": "ollama", "model": "stub"}
+    cfg = {
+        "steps": [
+            {
+                "step": 1,
+                "inputs": ["userRequest"],
+                "outputs": {"left": "string"},
+                "systemPrompt": "wait {{userRequest}}",
+                "model": model,
+            },
+            {
+                "step": 2,
+                "inputs": ["userRequest"],
+                "outputs": {"right": "string"},
+                "systemPrompt": "wait too",
+                "model": model,
+            },
+            {
+                "step": 3,
+                "inputs": ["left", "right"],
+                "outputs": {"both": "string"},
+                "systemPrompt": "both: {{left}} / {{right}}",
+                "model": model,
+            },
+        ]
+    }
+    assert chainrunner.run_chain(cfg, "x") == "both: wait x / wait too"
+
+
+def test_max_workers_defaults_to_one(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("LCDR_MAX_WORKERS", raising=False)
+    assert chainrunner._env_workers("LCDR_MAX_WORKERS", 1) == 1
+
+
+def test_run_chain_keeps_side_effect_order_sequentially(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(chainrunner, "MAX_WORKERS", 1)
+
+    shared = tmp_path / "shared.txt"
+    writer = tmp_path / "writer.py"
+    writer.write_text(
+        "import sys, time, pathlib\n"
+        "time.sleep(0.2)\n"
+        "pathlib.Path(sys.argv[1]).write_text(sys.argv[2])\n"
+        "print('written')\n",
+        encoding="utf-8",
+    )
+    reader = tmp_path / "reader.py"
+    reader.write_text(
+        "import sys, pathlib\n"
+        "p = pathlib.Path(sys.argv[1])\n"
+        "print(p.read_text() if p.exists() else 'MISSING')\n",
+        encoding="utf-8",
+    )
+    cfg = {
+        "steps": [
+            {
+                "step": 1,
+                "inputs": ["userRequest"],
+                "outputs": {"status": "string"},
+                "command": [sys.executable, str(writer), str(shared), "{{userRequest}}"],
+            },
+            {
+                "step": 2,
+                "inputs": ["userRequest"],
+                "outputs": {"contents": "string"},
+                "command": [sys.executable, str(reader), str(shared)],
+            },
+        ]
+    }
+    assert chainrunner.run_chain(cfg, "hello") == "hello"
+
+
+@pytest.mark.parametrize("raw, expected", [("", 1), ("3", 3), (" 2 ", 2)])
+def test_env_workers_parses_positive_integers(
+    monkeypatch: pytest.MonkeyPatch, raw: str, expected: int
+) -> None:
+    monkeypatch.setenv("LCDR_MAX_WORKERS", raw)
+    assert chainrunner._env_workers("LCDR_MAX_WORKERS", 1) == expected
+
+
+@pytest.mark.parametrize("raw", ["four", "0", "-2", "1.5"])
+def test_env_workers_rejects_invalid_values(
+    monkeypatch: pytest.MonkeyPatch, raw: str
+) -> None:
+    monkeypatch.setenv("LCDR_MAX_WORKERS", raw)
+    with pytest.raises(SystemExit, match="LCDR_MAX_WORKERS must be a positive integer"):
+        chainrunner._env_workers("LCDR_MAX_WORKERS", 1)
+
+
+def test_command_executor_runs_other_commands_as_processes(tmp_path: Path) -> None:
+    script = tmp_path / "echo.py"
+    script.write_text("import sys; print('out:' + sys.argv[1])", encoding="utf-8")
+    proc = chainrunner._CommandExecutor().run([sys.executable, str(script), "x"])
+    assert proc.stdout.strip() == b"out:x"
+
+
+@pytest.mark.parametrize(
+    "snippet, expected",
+    [
+        ("import subprocess, sys; subprocess.run([sys.executable, '-c', 'print(1)'])", b"1"),
+        ("import os; os.system('echo hi')", b"hi"),
+        ("import os; os.write(1, b'raw\\n')", b"raw"),
+        ("import sys; sys.stdout.buffer.write(b'hello\\n')", b"hello"),
+        ("import sys; sys.stdout.buffer.write(b'\\xff\\xfe')", b"\xff\xfe"),
+    ],
+)
+def test_command_executor_captures_fd_level_output(snippet: str, expected: bytes) -> None:
+    executor = chainrunner._CommandExecutor()
+    try:
+        proc = executor.run(make_python_command(snippet))
+        assert proc.stdout.strip() == expected
+        assert proc.stdout.strip() == subprocess.run(
+            make_python_command(snippet), capture_output=True, check=True
+        ).stdout.strip()
+    finally:
+        executor.close()
+
+
+@pytest.mark.parametrize(
+    "snippet, args",
+    [
+        ("import sys; sys.stdout.buffer.write(b'\\x00\\xff' + bytes(range(256)))", []),
+        ("import os, sys; sys.stdout.buffer.write(os.fsencode(sys.argv[1]))", ["caf\udce9"]),
+        ("import sys; print('\u00e9\u20ac'); sys.stderr.write('warn\\n')", []),
+        (
+            "import threading, time; "
+            "threading.Thread(target=lambda: (time.sleep(.2), print('late'))).start(); "
+            "print('early')",
+            [],
+        ),
+    ],
+)
+def test_command_executor_matches_subprocess_bytes(snippet: str, args: list[str]) -> None:
+    cmd = make_python_command(snippet, *args)
+    executor = chainrunner._CommandExecutor()
+    try:
+        proc = executor.run(cmd)
+    finally:
+        executor.close()
+    expected = subprocess.run(cmd, capture_output=True, check=True)
+    assert isinstance(proc, subprocess.CompletedProcess)
+    assert type(proc.stdout) is type(proc.stderr) is bytes
+    assert (proc.returncode, proc.stdout, proc.stderr) == (
+        expected.returncode,
+        expected.stdout,
+        expected.stderr,
+    )
+
+
+def test_command_executor_stays_in_sync_after_raw_output() -> None:
+    cfg = {
+        "steps": [
+            {
+                "step": 1,
+                "inputs": ["userRequest"],
+                "outputs": {"echoed": "string"},
+                "command": make_python_command("import os; os.system('echo hi')"),
+            },
+            {
+                "step": 2,
+                "inputs": ["echoed"],
+                "outputs": {"result": "string"},
+                "command": make_python_command(
+                    "import sys; print(sys.argv[1] + '!')", "{{echoed}}"
+                ),
+            },
+            {
+                "step": 3,
+                "inputs": ["result"],
+                "outputs": {"final": "string"},
+                "command": make_python_command(
+                    "import sys; print(sys.argv[1] + '?')", "{{result}}"
+                ),
+            },
+        ]
+    }
+    assert chainrunner.run_chain(cfg, "ignored") == "hi!?"
+
+
+def test_command_executor_isolates_interpreter_state() -> None:
+    executor = chainrunner._CommandExecutor()
+    try:
+        executor.run(
+            make_python_command(
+                "import json, sys; json.dumps = None; sys.path.insert(0, '/nowhere'); x = 1"
+            )
+        )
+        proc = executor.run(
+            make_python_command(
+                "import json, sys; print(json.dumps('/nowhere' in sys.path), 'x' in globals())"
+            )
+        )
+        assert proc.stdout.strip() == b"false False"
+    finally:
+        executor.close()
+
+
+def test_command_executor_reports_exit_codes_and_stderr() -> None:
+    executor = chainrunner._CommandExecutor()
+    try:
+        with pytest.raises(subprocess.CalledProcessError) as info:
+            executor.run(make_python_command("import os; os.write(2, b'bad'); os._exit(3)"))
+        assert info.value.returncode == 3
+        assert info.value.stderr == b"bad"
+        with pytest.raises(subprocess.CalledProcessError) as info:
+            executor.run(make_python_command("raise SystemExit('boom')"))
+        assert info.value.returncode == 1
+        assert info.value.stderr.strip() == b"boom"
+    finally:
+        executor.close()
+
+
+def test_command_executor_traceback_matches_python_c() -> None:
+    cmd = make_python_command("def f():\n    1 / 0\nf()")
+    executor = chainrunner._CommandExecutor()
+    try:
+        with pytest.raises(subprocess.CalledProcessError) as info:
+            executor.run(cmd)
+    finally:
+        executor.close()
+    expected = subprocess.run(cmd, capture_output=True)
+    assert info.value.returncode == expected.returncode == 1
+    assert info.value.stderr == expected.stderr
+
+
+def test_command_executor_ignores_modules_shadowed_by_cwd(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    (tmp_path / "tempfile.py").write_text("", encoding="utf-8")
+    (tmp_path / "helper.py").write_text("VALUE = 42\n", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    executor = chainrunner._CommandExecutor()
+    try:
+        proc = executor.run(make_python_command("import helper; print(helper.VALUE)"))
+    finally:
+        executor.close()
+    assert proc.stdout.strip() == b"42"
+
+
+def test_command_executor_recovers_from_dead_worker() -> None:
+    executor = chainrunner._CommandExecutor()
+    try:
+        executor.run(make_python_command("pass"))
+        assert executor._proc is not None
+        executor._proc.kill()
+        executor._proc.wait()
+        proc = executor.run(make_python_command("import sys; print(sys.argv[1:])", "a", "b"))
+        assert proc.stdout.strip() == b"['a', 'b']"
+    finally:
+        executor.close()
+
+
 # ---------------------------------------------------------------------------
 # CLI
 # ---------------------------------------------------------------------------
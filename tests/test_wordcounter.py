@@ -0,0 +1,39 @@
+"""Tests for the ``examples/wordcounter.py`` demo tool."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+EXAMPLES_PATH = PROJECT_ROOT / "examples"
+if str(EXAMPLES_PATH) not in sys.path:
+    sys.path.insert(0, str(EXAMPLES_PATH))
+
+import wordcounter
+
+
+N = wordcounter.VECTORIZE_THRESHOLD
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        pytest.param("word " * N, id="trailing-space"),
+        pytest.param(" \t\nlead" + " x" * N, id="leading-whitespace"),
+        pytest.param("a\x1cb\x1dc\x1e\x1fd " * N + "\x1f\x1c", id="separator-runs"),
+        pytest.param("\x1c\x1d\x1e\x1f" * N, id="only-separators"),
+        pytest.param("x" * N, id="single-word"),
+        pytest.param("\x0b\x0cone\r\ntwo  \x1e" + "-" * N + "\n", id="mixed"),
+    ],
+)
+def test_count_words_vectorized_matches_str_split(text: str) -> None:
+    pytest.importorskip("numpy")
+    assert len(text) >= wordcounter.VECTORIZE_THRESHOLD
+    assert wordcounter.count_words(text) == len(text.split())
+
+
+def test_count_words_short_input() -> None:
+    assert wordcounter.count_words("  one two\x1cthree  ") == 3